@@ -1,31 +1,99 @@
-from flask import Flask, request, jsonify, redirect, render_template_string
+from flask import Flask, Blueprint, current_app, request, jsonify, redirect
 from datetime import datetime, timedelta
-import sys
-import os
 import re
+import threading
 from collections import defaultdict
 
-# Add apps folder to Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'apps'))
+from .warmup import HotSet, StartupTimer, HOT_SET_SNAPSHOT_PATH, HOT_SET_SIZE
 
-from database import init_db, SessionLocal, URL, Click
-from utils import generate_short_code
-from sqlalchemy import func
-
-app = Flask(__name__)
+bp = Blueprint("shortener", __name__)
 
 # Rate limiting storage (in-memory)
 ip_requests = defaultdict(list)
 RATE_LIMIT_MAX = 5  # 5 URLs per hour per IP
 RATE_LIMIT_WINDOW = 3600  # 1 hour in seconds
 
-# Initialize database
-try:
-    init_db()
-    print("Database initialized successfully")
-except Exception as e:
-    print(f"Database error: {e}")
-    sys.exit(1)
+_init_lock = threading.Lock()
+
+def create_app(config=None):
+    """Application factory
+
+    Only cheap setup happens here: the hot set snapshot is loaded so the first
+    requests hit warm data. SQLAlchemy is imported and the schema is checked on
+    the first request instead.
+    """
+    timer = StartupTimer()
+
+    app = Flask(__name__)
+    app.config.update(
+        HOT_SET_SNAPSHOT_PATH=HOT_SET_SNAPSHOT_PATH,
+        HOT_SET_SIZE=HOT_SET_SIZE,
+    )
+    if config:
+        app.config.update(config)
+
+    hot_set = HotSet()
+    timer.hot_set_size = hot_set.load(app.config["HOT_SET_SNAPSHOT_PATH"])
+    app.logger.info("Prewarmed %d short codes from snapshot", timer.hot_set_size)
+
+    app.extensions["shortener"] = {
+        "timer": timer,
+        "hot_set": hot_set,
+        "db_ready": False,
+        "home_template": None,
+    }
+
+    app.before_request(_ensure_initialized)
+    app.register_blueprint(bp)
+
+    @app.cli.command("save-hot-set")
+    def save_hot_set_command():
+        """Snapshot the most-clicked short codes for the next startup."""
+        from .database import init_db
+        from .warmup import save_hot_set_snapshot
+        init_db()
+        count = save_hot_set_snapshot(app.config["HOT_SET_SNAPSHOT_PATH"], app.config["HOT_SET_SIZE"])
+        print(f"Saved {count} short codes to {app.config['HOT_SET_SNAPSHOT_PATH']}")
+
+    return app
+
+def _ensure_initialized():
+    """Import the database layer and check the schema on the first request"""
+    # Readiness probes must not trigger the DB init or count as real traffic
+    if request.endpoint == "shortener.startup_metrics":
+        return
+
+    state = current_app.extensions["shortener"]
+    timer = state["timer"]
+    timer.mark_first_request()
+    if state["db_ready"]:
+        return
+
+    with _init_lock:
+        if state["db_ready"]:
+            return
+        from .database import init_db
+
+        started = timer.elapsed()
+        try:
+            init_db()
+            print("Database initialized successfully")
+        except Exception as e:
+            # Leave db_ready unset so the next request retries
+            print(f"Database error: {e}")
+            raise
+        timer.db_init_seconds = timer.elapsed() - started
+        state["db_ready"] = True
+        timer.mark_warm()
+        current_app.logger.info("Worker warm: first request after %.3fs, warm after %.3fs",
+                                timer.time_to_first_request, timer.time_to_warm)
+
+def _home_template():
+    """Compile the home page template once per app instead of on every request"""
+    state = current_app.extensions["shortener"]
+    if state["home_template"] is None:
+        state["home_template"] = current_app.jinja_env.from_string(HTML_TEMPLATE)
+    return state["home_template"]
 
 def is_rate_limited(ip):
     """Check if IP is rate limited"""
@@ -389,12 +457,19 @@ HTML_TEMPLATE = """
 </html>
 """
 
-@app.route("/")
+@bp.route("/")
 def home():
-    return render_template_string(HTML_TEMPLATE)
+    return _home_template().render()
+
+@bp.route("/_health/startup")
+def startup_metrics():
+    return jsonify(current_app.extensions["shortener"]["timer"].as_dict())
 
-@app.route("/shorten", methods=["POST"])
+@bp.route("/shorten", methods=["POST"])
 def shorten_url():
+    from .database import SessionLocal, URL
+    from .utils import generate_short_code
+
     # Get client IP
     client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'unknown'))
     
@@ -438,18 +513,26 @@ def shorten_url():
     finally:
         db.close()
 
-@app.route("/<short_code>")
+@bp.route("/<short_code>")
 def redirect_url(short_code):
+    from .database import SessionLocal, URL, Click
     print(f"[DEBUG] Received short_code: {short_code}")
+    hot_set = current_app.extensions["shortener"]["hot_set"]
     db = SessionLocal()
     try:
-        url_record = db.query(URL).filter(URL.short_code == short_code).first()
-        print(f"[DEBUG] DB record found: {url_record}")
-
-        if not url_record:
-            return "URL not found", 404
-
-        if url_record.expires_at and datetime.utcnow() > url_record.expires_at:
+        # Snapshot entries are never invalidated; see HotSet
+        cached = hot_set.get(short_code)
+        if cached:
+            long_url, expires_at = cached
+        else:
+            url_record = db.query(URL).filter(URL.short_code == short_code).first()
+            print(f"[DEBUG] DB record found: {url_record}")
+
+            if not url_record:
+                return "URL not found", 404
+            long_url, expires_at = url_record.long_url, url_record.expires_at
+
+        if expires_at and datetime.utcnow() > expires_at:
             return """
             <html>
                 <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
@@ -466,13 +549,15 @@ def redirect_url(short_code):
         db.add(click)
         db.commit()
 
-        return redirect(url_record.long_url)
+        return redirect(long_url)
 
     finally:
         db.close()
 
-@app.route("/stats/<short_code>")
+@bp.route("/stats/<short_code>")
 def get_stats(short_code):
+    from sqlalchemy import func
+    from .database import SessionLocal, URL, Click
     db = SessionLocal()
     try:
         url_record = db.query(URL).filter(URL.short_code == short_code).first()
@@ -555,5 +640,6 @@ def get_stats(short_code):
         db.close()
 
 if __name__ == "__main__":
+    app = create_app()
     print("Starting Flask server on http://127.0.0.1:5000")
     app.run(host='127.0.0.1', port=5000, debug=True)
\ No newline at end of file
@@ -1,11 +1,18 @@
 from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
 from datetime import datetime
+import time
 
 # Database setup
 SQLALCHEMY_DATABASE_URL = "sqlite:///./url_shortener.db"
 
+# Bump when tables are added so existing databases run create_all once more.
+# create_all only creates missing tables; it never alters existing ones.
+SCHEMA_VERSION = 1
+INIT_DB_ATTEMPTS = 5
+
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -35,7 +42,58 @@ class Click(Base):
     # Relationship to URL
     url = relationship("URL", back_populates="clicks")
 
-def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully")
\ No newline at end of file
+# Schema version marker
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+def get_schema_version():
+    """Return the schema version stored in the database, or None if unknown"""
+    db = SessionLocal()
+    try:
+        row = db.query(SchemaVersion).first()
+        return row.version if row else None
+    except SQLAlchemyError:
+        db.rollback()
+        return None
+    finally:
+        db.close()
+
+def init_db(force=False):
+    """Initialize database tables, skipping create_all when the schema is current
+
+    Returns True if the tables were (re)created, False if the stored schema
+    version already matched SCHEMA_VERSION or another worker stamped it first.
+    """
+    if not force and get_schema_version() == SCHEMA_VERSION:
+        print(f"Database schema is up to date (version {SCHEMA_VERSION})")
+        return False
+
+    for attempt in range(INIT_DB_ATTEMPTS):
+        db = SessionLocal()
+        try:
+            Base.metadata.create_all(bind=engine)
+            row = db.query(SchemaVersion).first()
+            if row:
+                row.version = SCHEMA_VERSION
+            else:
+                db.add(SchemaVersion(id=1, version=SCHEMA_VERSION))
+            db.commit()
+            break
+        except (IntegrityError, OperationalError):
+            # Several workers starting cold race to create and stamp the schema;
+            # losing that race is fine once the winner has stamped our version
+            db.rollback()
+            if get_schema_version() == SCHEMA_VERSION:
+                print(f"Database schema initialized by another worker (version {SCHEMA_VERSION})")
+                return False
+            if attempt == INIT_DB_ATTEMPTS - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+        finally:
+            db.close()
+
+    print("Database tables created successfully")
+    return True
\ No newline at end of file
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# Snapshot of the most-clicked short codes, kept in the apps folder
+HOT_SET_SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "hot_set.json")
+HOT_SET_SIZE = 500
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class HotSet:
+    """In-memory short_code -> (long_url, expires_at) cache for popular links
+
+    Entries come only from the snapshot and live as long as the process: they
+    are never refreshed from the database, so a code removed from the database
+    keeps redirecting until the worker restarts with a new snapshot.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, short_code):
+        """Return (long_url, expires_at) for a cached code, or None"""
+        return self._entries.get(short_code)
+
+    def load(self, path):
+        """Load a persisted snapshot, returning the number of entries loaded"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            print(f"No hot set snapshot at {path}, starting cold")
+            return 0
+        except (OSError, ValueError) as e:
+            print(f"Could not read hot set snapshot {path}: {e}")
+            return 0
+
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_FORMAT_VERSION:
+            print(f"Ignoring hot set snapshot {path}: unsupported format")
+            return 0
+        if not isinstance(snapshot.get("entries"), list):
+            print(f"Ignoring hot set snapshot {path}: entries is not a list")
+            return 0
+
+        now = datetime.utcnow()
+        entries = {}
+        skipped = 0
+        for entry in snapshot["entries"]:
+            try:
+                short_code = entry["short_code"]
+                long_url = entry["long_url"]
+                expires_at = entry.get("expires_at")
+                if not isinstance(short_code, str) or not isinstance(long_url, str):
+                    raise TypeError("short_code and long_url must be strings")
+                if expires_at:
+                    expires_at = datetime.fromisoformat(expires_at)
+            except (KeyError, TypeError, ValueError, AttributeError):
+                skipped += 1
+                continue
+            # Expired links are served from the database so they get a 410
+            if expires_at and now > expires_at:
+                continue
+            entries[short_code] = (long_url, expires_at)
+
+        if skipped:
+            print(f"Skipped {skipped} malformed entries in hot set snapshot {path}")
+
+        with self._lock:
+            self._entries.update(entries)
+        return len(entries)
+
+
+def save_hot_set_snapshot(path=HOT_SET_SNAPSHOT_PATH, limit=HOT_SET_SIZE):
+    """Persist the most-clicked short codes so new workers can prewarm"""
+    from sqlalchemy import func
+    from .database import SessionLocal, URL, Click
+
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            URL.short_code,
+            URL.long_url,
+            URL.expires_at,
+            func.count(Click.id).label('clicks')
+        ).join(
+            Click, Click.short_code == URL.short_code
+        ).filter(
+            (URL.expires_at.is_(None)) | (URL.expires_at > datetime.utcnow())
+        ).group_by(
+            URL.short_code, URL.long_url, URL.expires_at
+        ).order_by(
+            func.count(Click.id).desc()
+        ).limit(limit).all()
+    finally:
+        db.close()
+
+    snapshot = {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "generated_at": datetime.utcnow().isoformat(),
+        "entries": [
+            {
+                "short_code": row.short_code,
+                "long_url": row.long_url,
+                "expires_at": row.expires_at.isoformat() if row.expires_at else None,
+                "clicks": row.clicks,
+            }
+            for row in rows
+        ],
+    }
+
+    # Write atomically so a worker starting mid-write never sees a partial file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+class StartupTimer:
+    """Records how long a worker takes to serve its first request and get warm"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.time_to_first_request = None
+        self.time_to_warm = None
+        self.db_init_seconds = None
+        self.hot_set_size = 0
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def mark_first_request(self):
+        if self.time_to_first_request is None:
+            self.time_to_first_request = self.elapsed()
+
+    def mark_warm(self):
+        if self.time_to_warm is None:
+            self.time_to_warm = self.elapsed()
+
+    def as_dict(self):
+        return {
+            "time_to_first_request": self.time_to_first_request,
+            "time_to_warm": self.time_to_warm,
+            "db_init_seconds": self.db_init_seconds,
+            "hot_set_size": self.hot_set_size,
+        }
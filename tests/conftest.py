@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from apps import database
+from apps.app import create_app
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the database module at a throwaway SQLite file"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return tmp_path / "hot_set.json"
+
+
+@pytest.fixture
+def make_app(temp_db, snapshot_path):
+    def _make_app():
+        return create_app({"TESTING": True, "HOT_SET_SNAPSHOT_PATH": str(snapshot_path)})
+    return _make_app
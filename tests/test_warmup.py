@@ -0,0 +1,99 @@
+import json
+from datetime import datetime, timedelta
+
+from apps import database
+from apps.warmup import HotSet, save_hot_set_snapshot
+
+
+def write_snapshot(path, entries):
+    path.write_text(json.dumps({"version": 1, "entries": entries}))
+
+
+def add_url(short_code, long_url, expires_at=None, clicks=0):
+    db = database.SessionLocal()
+    try:
+        db.add(database.URL(short_code=short_code, long_url=long_url, expires_at=expires_at))
+        for _ in range(clicks):
+            db.add(database.Click(short_code=short_code, ip_address="test"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_redirect_served_from_snapshot(make_app, snapshot_path):
+    # Not in the database, so only the snapshot can answer
+    write_snapshot(snapshot_path, [{"short_code": "hot123", "long_url": "https://example.com/hot"}])
+    client = make_app().test_client()
+
+    response = client.get("/hot123")
+
+    assert response.status_code == 302
+    assert response.location == "https://example.com/hot"
+
+
+def test_expired_snapshot_entry_falls_through_to_db(make_app, snapshot_path):
+    expired = datetime.utcnow() - timedelta(days=1)
+    write_snapshot(snapshot_path, [{
+        "short_code": "old123",
+        "long_url": "https://example.com/old",
+        "expires_at": expired.isoformat(),
+    }])
+    app = make_app()
+    assert app.extensions["shortener"]["hot_set"].get("old123") is None
+
+    client = app.test_client()
+    client.get("/")
+    add_url("old123", "https://example.com/old", expires_at=expired)
+
+    assert client.get("/old123").status_code == 410
+
+
+def test_init_db_skips_create_all_when_schema_current(temp_db):
+    assert database.init_db() is True
+    assert database.init_db() is False
+    assert database.get_schema_version() == database.SCHEMA_VERSION
+
+
+def test_corrupt_snapshot_does_not_crash_startup(make_app, snapshot_path):
+    for content in ("not json", "[]", json.dumps({"version": 1, "entries": {}})):
+        snapshot_path.write_text(content)
+        assert len(make_app().extensions["shortener"]["hot_set"]) == 0
+
+    write_snapshot(snapshot_path, [
+        {"short_code": "bad1", "long_url": "https://example.com", "expires_at": "garbage"},
+        {"short_code": "bad2"},
+        "not a dict",
+        {"short_code": "good1", "long_url": "https://example.com/good"},
+    ])
+    hot_set = make_app().extensions["shortener"]["hot_set"]
+    assert len(hot_set) == 1
+    assert hot_set.get("good1") == ("https://example.com/good", None)
+
+
+def test_startup_metrics_record_first_request_and_warm(make_app):
+    client = make_app().test_client()
+
+    # The probe itself must not count as the first request
+    metrics = client.get("/_health/startup").get_json()
+    assert metrics["time_to_first_request"] is None
+    assert metrics["time_to_warm"] is None
+
+    assert client.get("/").status_code == 200
+    metrics = client.get("/_health/startup").get_json()
+    assert metrics["time_to_first_request"] is not None
+    assert metrics["time_to_warm"] >= metrics["time_to_first_request"]
+
+
+def test_save_hot_set_snapshot_round_trip(temp_db, snapshot_path):
+    database.init_db()
+    add_url("popular", "https://example.com/popular", clicks=3)
+    add_url("quiet", "https://example.com/quiet", clicks=1)
+    add_url("unclicked", "https://example.com/unclicked")
+
+    assert save_hot_set_snapshot(str(snapshot_path), limit=10) == 2
+
+    hot_set = HotSet()
+    assert hot_set.load(str(snapshot_path)) == 2
+    assert hot_set.get("popular") == ("https://example.com/popular", None)
+    assert hot_set.get("quiet") == ("https://example.com/quiet", None)
+    assert hot_set.get("unclicked") is None